@@ -16,6 +16,13 @@ from backend.models.schemas import JobStatus
 
 
 class Job:
+    # Jobs stay in memory for up to 24 h (see cleanup_old_jobs) — slots keep
+    # each one free of a per-instance __dict__.
+    __slots__ = (
+        "job_id", "text", "status", "progress", "message", "spec", "preview",
+        "ifc_path", "preview_png", "error", "created_at", "updated_at",
+    )
+
     def __init__(self, job_id: str, text: str):
         self.job_id      = job_id
         self.text        = text
@@ -180,6 +180,17 @@ _EXAMPLES = [
     },
 ]
 
+# Examples as alternating user/assistant chat turns — built once, shared by
+# every provider call (the SDKs only read the message dicts)
+_FEW_SHOT_MESSAGES = tuple(
+    msg
+    for ex in _EXAMPLES
+    for msg in (
+        {"role": "user",      "content": ex["user"]},
+        {"role": "assistant", "content": ex["assistant"]},
+    )
+)
+
 
 # ── Layout variant pool ────────────────────────────────────────────────────────
 # One is picked at random per generation call and appended to the user prompt.
@@ -228,6 +239,9 @@ def _pick_layout_variant() -> str:
 
 # ── JSON extraction helpers ────────────────────────────────────────────────────
 
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+
+
 def _extract_json(text: str) -> dict:
     """
     Extract and parse a JSON object from an LLM response.
@@ -240,24 +254,39 @@ def _extract_json(text: str) -> dict:
         pass
 
     # 2. Strip markdown fences (```json ... ``` or ``` ... ```)
-    fence = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+    fence = _FENCE_RE.search(text)
     if fence:
         try:
             return json.loads(fence.group(1).strip())
         except json.JSONDecodeError:
             pass
 
-    # 3. Greedy: find the outermost {...} block
-    brace = re.search(r"\{[\s\S]*\}", text)
-    if brace:
+    # 3. Greedy: the outermost {...} block runs from the first '{' to the last '}'
+    start = text.find("{")
+    end   = text.rfind("}")
+    if start != -1 and end > start:
         try:
-            return json.loads(brace.group(0))
+            return json.loads(text[start:end + 1])
         except json.JSONDecodeError:
             pass
 
     raise ValueError(f"Could not extract valid JSON from LLM response:\n{text[:500]}")
 
 
+_REQUIRED_FIELDS = frozenset({"type", "x", "y", "width", "height"})
+_VALID_TYPES = frozenset({
+    "bedroom", "bathroom", "living", "kitchen", "dining",
+    "hallway", "balcony", "garden", "parking", "storage",
+    "stair", "veranda", "other",
+})
+# Common room-type aliases the LLM emits
+_TYPE_ALIASES = {
+    "living_room": "living", "lounge": "living",
+    "dining_room": "dining",
+    "balcony": "balcony", "terrace": "balcony", "veranda": "balcony",
+}
+
+
 def _validate_room_graph(data: dict) -> dict:
     """
     Validate and normalise the LLM-generated room_graph dict.
@@ -270,30 +299,19 @@ def _validate_room_graph(data: dict) -> dict:
     if not rooms or not isinstance(rooms, list):
         raise ValueError("LLM output missing 'rooms' list")
 
-    required = {"type", "x", "y", "width", "height"}
-    valid_types = {
-        "bedroom", "bathroom", "living", "kitchen", "dining",
-        "hallway", "balcony", "garden", "parking", "storage",
-        "stair", "veranda", "other",
-    }
-
     cleaned = []
     for i, r in enumerate(rooms):
         if not isinstance(r, dict):
             continue
-        missing = required - r.keys()
+        missing = _REQUIRED_FIELDS - r.keys()
         if missing:
             print(f"[LLM] Room {i} missing fields {missing} — skipping")
             continue
         # Normalise type to lowercase, replace spaces
         rtype = str(r["type"]).lower().strip().replace(" ", "_")
         # Map common aliases
-        rtype = {
-            "living_room": "living", "lounge": "living",
-            "dining_room": "dining",
-            "balcony": "balcony", "terrace": "balcony", "veranda": "balcony",
-        }.get(rtype, rtype)
-        if rtype not in valid_types:
+        rtype = _TYPE_ALIASES.get(rtype, rtype)
+        if rtype not in _VALID_TYPES:
             rtype = "other"
 
         cleaned.append({
@@ -345,11 +363,11 @@ def _call_openai(prompt: str, api_key: str, model: str,
         kwargs["base_url"] = base_url
 
     client = OpenAI(**kwargs)
-    messages = [{"role": "system", "content": _SYSTEM_PROMPT}]
-    for ex in _EXAMPLES:
-        messages.append({"role": "user",      "content": ex["user"]})
-        messages.append({"role": "assistant", "content": ex["assistant"]})
-    messages.append({"role": "user", "content": prompt})
+    messages = [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        *_FEW_SHOT_MESSAGES,
+        {"role": "user", "content": prompt},
+    ]
 
     try:
         resp = client.chat.completions.create(
@@ -374,13 +392,9 @@ def _call_anthropic(prompt: str, api_key: str, model: str) -> str:
         )
     client = Anthropic(api_key=api_key)
 
-    # Build user message that embeds few-shot examples as Human/Assistant turns
+    # Few-shot examples go in as Human/Assistant turns
     # Anthropic uses alternating user/assistant in `messages`
-    messages = []
-    for ex in _EXAMPLES:
-        messages.append({"role": "user",      "content": ex["user"]})
-        messages.append({"role": "assistant", "content": ex["assistant"]})
-    messages.append({"role": "user", "content": prompt})
+    messages = [*_FEW_SHOT_MESSAGES, {"role": "user", "content": prompt}]
 
     resp = client.messages.create(
         model=model,
@@ -32,6 +32,15 @@ ROOM_SIZE_RANGES = {
     "inner":    ((1.2, 2.0), (2.0, 3.5)),
 }
 
+# Placement order with the maximum count of each type the packer will place
+PLACEMENT_ORDER = (
+    ("inner",   1), ("living",   1), ("kitchen", 1),
+    ("bedroom", 4), ("bathroom", 3),
+    ("balcony", 1), ("veranda",  1), ("garden",  1), ("pool", 1),
+    ("storage", 1), ("parking",  1), ("stair",   1),
+)
+
+
 def _rand_size(room_type: str):
     rw, rh = ROOM_SIZE_RANGES.get(room_type, ((2.5, 4.0), (2.5, 4.0)))
     w = round(random.uniform(*rw), 1)
@@ -44,27 +53,14 @@ def generate_mock_layout(spec: Dict[str, Any]) -> List[Dict]:
     Generate a simple grid-packed room layout from a normalised spec dict.
     Returns a list of room dicts matching the RoomGraphToIFC input format.
     """
-    # Build ordered room list from spec
-    room_order = [
-        "inner", "living", "kitchen",
-        "bedroom", "bedroom", "bedroom", "bedroom",
-        "bathroom", "bathroom", "bathroom",
-        "balcony", "veranda", "garden", "pool",
-        "storage", "parking", "stair",
-    ]
-
+    # Build ordered room list from spec in one pass over (type, max count)
     rooms_to_place = []
-    type_count: Dict[str, int] = {}
-
-    for rtype in room_order:
-        wanted = int(spec.get(rtype, 0))
-        placed  = type_count.get(rtype, 0)
-        if placed < wanted:
-            rooms_to_place.append(rtype)
-            type_count[rtype] = placed + 1
+    for rtype, cap in PLACEMENT_ORDER:
+        rooms_to_place.extend([rtype] * min(int(spec.get(rtype, 0)), cap))
 
     # Pack rooms in rows — simple greedy strip packing
     rooms: List[Dict] = []
+    type_count: Dict[str, int] = {}
     row_x, row_y = 0.0, 0.0
     row_height    = 0.0
     MAX_ROW_WIDTH = math.sqrt(float(spec.get("net_area", 100))) * 1.4
@@ -79,7 +75,7 @@ def generate_mock_layout(spec: Dict[str, Any]) -> List[Dict]:
             row_height = 0.0
 
         rooms.append({
-            "id":     f"{rtype}_{type_count.get(rtype+'_placed', 0)}",
+            "id":     f"{rtype}_{type_count.get(rtype, 0)}",
             "type":   rtype,
             "x":      round(row_x, 2),
             "y":      round(row_y, 2),
@@ -89,7 +85,7 @@ def generate_mock_layout(spec: Dict[str, Any]) -> List[Dict]:
 
         row_x      += w + 0.2
         row_height  = max(row_height, h)
-        type_count[rtype + '_placed'] = type_count.get(rtype + '_placed', 0) + 1
+        type_count[rtype] = type_count.get(rtype, 0) + 1
 
     return rooms
 
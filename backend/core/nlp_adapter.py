@@ -14,6 +14,27 @@ from typing import Dict, Any, Optional
 
 NLP_MODEL_PATH = Path(__file__).parent.parent.parent / "models" / "nlp_t5" / "final_model"
 
+# Max number of parsed prompts kept in memory
+PARSE_CACHE_SIZE = 256
+
+# ── Rule-based extraction patterns (applied to lower-cased text) ─────────────
+_BEDROOM_RE   = re.compile(r'(\d+)\s*(?:bed(?:room)?s?|br|bhk)')
+_BATHROOM_RE  = re.compile(r'(\d+)\s*(?:bath(?:room)?s?|ba\b|washroom)')
+_MARLA_RE     = re.compile(r'(\d+(?:\.\d+)?)\s*marla')
+_SQM_RE       = re.compile(r'(\d+)\s*(?:sqm|sq\.?\s*m(?:etre|eter)?s?|m2)')
+_SQFT_RE      = re.compile(r'(\d+)\s*(?:sq\.?\s*ft|sqft)')
+_POOL_RE      = re.compile(r'\bpool\b|swimming')
+_STORAGE_RE   = re.compile(r'storage|store\s*room')
+_PARKING_RE   = re.compile(r'park|garage|car\s*port')
+_STAIR_RE     = re.compile(r'stair|two\s*stor|2\s*stor|double\s*stor')
+# Prompts matching this never take the fast path: rooms only T5 extracts, and
+# kitchen/living counts (the rule-based spec fixes both at 1)
+_T5_ONLY_RE   = re.compile(
+    r'dining|study|office|hall|corridor|lobby|foyer|lounge|drawing|family\s*room|'
+    r'laundry|utility|closet|terrace|guest|servant|maid|prayer|library|gym|\bden\b|'
+    r'kitchens|living\s*rooms|(?:\d+|two|three|four|double)\s*(?:kitchen|living)'
+)
+
 
 class NLPAdapter:
     """
@@ -26,6 +47,7 @@ class NLPAdapter:
         self._model      = None
         self._tokenizer  = None
         self.is_fallback = False
+        self._parse_cache: Dict[str, Dict[str, Any]] = {}
         self._load()
 
     def _load(self):
@@ -50,24 +72,85 @@ class NLPAdapter:
         Parse a natural language description into a structured spec dict.
 
         Returns a dict compatible with spec_converter.normalise_spec().
+        T5 results are cached per prompt (whitespace-normalised), so a repeated
+        prompt skips inference; callers get their own copy. Prompts the
+        rule-based extractor fully covers (see _fast_parse) skip T5 entirely.
         """
-        if not self.is_fallback and self._model is not None:
-            try:
-                result = self._model.predict(text)
-                if isinstance(result, dict) and result:
-                    return result
-            except Exception as e:
-                print(f"[NLP] Inference error ({e}), falling back to regex")
-
-        return self._fallback_parse(text)
+        key    = " ".join(text.split())
+        cached = self._parse_cache.get(key)
+        if cached is not None:
+            return dict(cached)
 
-    @staticmethod
-    def _fallback_parse(text: str) -> Dict[str, Any]:
+        result = None
+        if not self.is_fallback and self._model is not None:
+            result = self._fast_parse(text)
+            if result is None:
+                try:
+                    result = self._model.predict(text)
+                    if not (isinstance(result, dict) and result):
+                        result = None
+                except Exception as e:
+                    print(f"[NLP] Inference error ({e}), falling back to regex")
+                    result = None
+
+        # Only model / fast-path results are cached — a regex fallback after a
+        # transient inference error must not stick to the prompt.
+        if result is None:
+            return self._fallback_parse(text)
+
+        if len(self._parse_cache) >= PARSE_CACHE_SIZE:
+            self._parse_cache.pop(next(iter(self._parse_cache)))
+        self._parse_cache[key] = result
+        return dict(result)
+
+    @classmethod
+    def _fast_parse(cls, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Rule-based spec when the rule-based extractor covers the whole prompt:
+        bedroom and bathroom counts and the area are all stated, no room only
+        T5 knows about (dining, study, hallway, ...) is mentioned, and no
+        kitchen/living count is given. Returns None otherwise so T5 runs.
+        """
+        t = text.lower()
+        if _T5_ONLY_RE.search(t):
+            return None
+        bed_m = _BEDROOM_RE.search(t)
+        if not bed_m:
+            return None
+        bath_m = _BATHROOM_RE.search(t)
+        if not bath_m:
+            return None
+        area = cls._stated_area(t)
+        if area is None:
+            return None
+        return cls._rule_spec(t, bed_m, bath_m, area)
+
+    @classmethod
+    def _fallback_parse(cls, text: str) -> Dict[str, Any]:
         """
         Rule-based extraction from text when T5 model isn't available.
         Handles common patterns like '3 bedroom house' / '5 marla' / 'with balcony'.
         """
         t = text.lower()
+        return cls._rule_spec(t, _BEDROOM_RE.search(t), _BATHROOM_RE.search(t), cls._stated_area(t))
+
+    @staticmethod
+    def _stated_area(t: str) -> Optional[int]:
+        """Net area in m² if the lower-cased text states one, else None."""
+        m = _MARLA_RE.search(t)
+        if m:
+            return round(float(m.group(1)) * 25.2)  # 1 marla ≈ 25.2 m²
+        m = _SQM_RE.search(t)
+        if m:
+            return int(m.group(1))
+        m = _SQFT_RE.search(t)
+        if m:
+            return round(int(m.group(1)) * 0.0929)
+        return None
+
+    @staticmethod
+    def _rule_spec(t: str, bed_m, bath_m, area: Optional[int]) -> Dict[str, Any]:
+        """Build the rule-based spec from lower-cased text and pre-run matches."""
         spec: Dict[str, Any] = {}
 
         # Unit type
@@ -78,42 +161,23 @@ class NLPAdapter:
         else:
             spec["unit_type"] = "house"
 
-        # Bedroom count
-        m = re.search(r'(\d+)\s*(?:bed(?:room)?s?|br|bhk)', t)
-        spec["bedroom"] = int(m.group(1)) if m else 2
-
-        # Bathroom count
-        m = re.search(r'(\d+)\s*(?:bath(?:room)?s?|ba\b|washroom)', t)
-        spec["bathroom"] = int(m.group(1)) if m else 1
-
-        # Area
-        m = re.search(r'(\d+(?:\.\d+)?)\s*marla', t)
-        if m:
-            spec["net_area"] = round(float(m.group(1)) * 25.2)  # 1 marla ≈ 25.2 m²
-        else:
-            m = re.search(r'(\d+)\s*(?:sqm|sq\.?\s*m(?:etre|eter)?s?|m2)', t)
-            if m:
-                spec["net_area"] = int(m.group(1))
-            else:
-                m = re.search(r'(\d+)\s*(?:sq\.?\s*ft|sqft)', t)
-                if m:
-                    spec["net_area"] = round(int(m.group(1)) * 0.0929)
-                else:
-                    spec["net_area"] = 60 + spec["bedroom"] * 28
+        spec["bedroom"]  = int(bed_m.group(1)) if bed_m else 2
+        spec["bathroom"] = int(bath_m.group(1)) if bath_m else 1
+        spec["net_area"] = area if area is not None else 60 + spec["bedroom"] * 28
 
         # Fixed rooms
         spec["living"]  = 1
         spec["kitchen"] = 1
         spec["inner"]   = 1 if spec["bedroom"] >= 3 else 0
 
-        # Optional rooms from keywords
-        spec["balcony"]  = 1 if re.search(r'balcon', t) else 0
-        spec["veranda"]  = 1 if re.search(r'veranda|porch', t) else 0
-        spec["garden"]   = 1 if re.search(r'garden|lawn|yard', t) else 0
-        spec["pool"]     = 1 if re.search(r'\bpool\b|swimming', t) else 0
-        spec["storage"]  = 1 if re.search(r'storage|store\s*room', t) else 0
-        spec["parking"]  = 1 if re.search(r'park|garage|car\s*port', t) else 0
-        spec["stair"]    = 1 if re.search(r'stair|two\s*stor|2\s*stor|double\s*stor', t) else 0
+        # Optional rooms from keywords (plain substrings need no regex engine)
+        spec["balcony"]  = 1 if "balcon" in t else 0
+        spec["veranda"]  = 1 if "veranda" in t or "porch" in t else 0
+        spec["garden"]   = 1 if "garden" in t or "lawn" in t or "yard" in t else 0
+        spec["pool"]     = 1 if _POOL_RE.search(t) else 0
+        spec["storage"]  = 1 if _STORAGE_RE.search(t) else 0
+        spec["parking"]  = 1 if _PARKING_RE.search(t) else 0
+        spec["stair"]    = 1 if _STAIR_RE.search(t) else 0
 
         return spec
 
@@ -16,6 +16,8 @@ import sys
 import math as _math
 import re as _re
 import asyncio
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -28,9 +30,8 @@ if str(_SCRIPTS) not in sys.path:
 
 from backend.core.job_manager    import Job, JobStatus
 from backend.core.nlp_adapter    import get_nlp_adapter
-from backend.core.mock_gnn       import MockGNNAdapter
-from backend.core.real_gnn       import get_real_gnn
-from backend.core.spec_converter import normalise_spec
+# real_gnn (torch) is imported on first GNN-mode job, so LLM-only runs and
+# helpers like _validate_and_fix / _render_png don't pay torch's import cost.
 
 # Generator mode: "llm" uses the LLM adapter (default), "gnn" uses the trained GNN.
 # Override with the GENERATOR_MODE environment variable.
@@ -40,39 +41,35 @@ IFC_OUTPUT_DIR = _ROOT / "output" / "api_generated"
 PNG_OUTPUT_DIR = _ROOT / "output" / "api_generated"
 IFC_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+
+# ── Plot-size patterns (checked in order; first match wins) ──────────────────
+_PLOT_ASPECT    = 1.8
+_MARLA_RE       = _re.compile(r'(\d+(?:\.\d+)?)\s*marla', _re.IGNORECASE)   # 1 marla = 25.2929 m²
+_KANAL_RE       = _re.compile(r'(\d+(?:\.\d+)?)\s*kanal', _re.IGNORECASE)   # 1 kanal = 505.857 m²
+# Square metres: "150 sqm", "150 m²", "150 sq m", "150 square metres"
+_SQM_RE         = _re.compile(
+    r'(\d+(?:\.\d+)?)\s*(?:sqm|m²|sq\.?\s*m|square\s*met(?:re|er)s?)', _re.IGNORECASE)
+# Metres × metres: "10m x 8m", "10 by 8 metres", "10×8m"
+_DIMS_RE        = _re.compile(
+    r'(\d+(?:\.\d+)?)\s*m?\s*[x×by]\s*(\d+(?:\.\d+)?)\s*m', _re.IGNORECASE)
+_AREA_UNIT_RES  = ((_MARLA_RE, 25.2929), (_KANAL_RE, 505.857), (_SQM_RE, 1.0))
+
+
+@lru_cache(maxsize=256)
 def _extract_plot_from_text(text: str):
     """
     Return (plot_w, plot_h) in metres if a plot size is mentioned in the text,
     otherwise return (None, None). Uses aspect ratio 1.8 (width:depth) for
     area-based units, matching the frontend plotUnits.ts conversion.
+    Results are memoised per prompt, so resubmitted prompts skip the scan.
     """
-    ASPECT = 1.8
-
-    def area_to_dims(area_m2: float):
-        h = _math.sqrt(area_m2 / ASPECT)
-        return round(h * ASPECT, 2), round(h, 2)
-
-    # Marla  (1 marla = 25.2929 m²)
-    m = _re.search(r'(\d+(?:\.\d+)?)\s*marla', text, _re.IGNORECASE)
-    if m:
-        return area_to_dims(float(m.group(1)) * 25.2929)
-
-    # Kanal  (1 kanal = 505.857 m²)
-    m = _re.search(r'(\d+(?:\.\d+)?)\s*kanal', text, _re.IGNORECASE)
-    if m:
-        return area_to_dims(float(m.group(1)) * 505.857)
+    for pattern, m2_per_unit in _AREA_UNIT_RES:
+        m = pattern.search(text)
+        if m:
+            h = _math.sqrt(float(m.group(1)) * m2_per_unit / _PLOT_ASPECT)
+            return round(h * _PLOT_ASPECT, 2), round(h, 2)
 
-    # Square metres: "150 sqm", "150 m²", "150 sq m", "150 square metres"
-    m = _re.search(
-        r'(\d+(?:\.\d+)?)\s*(?:sqm|m²|sq\.?\s*m|square\s*met(?:re|er)s?)',
-        text, _re.IGNORECASE)
-    if m:
-        return area_to_dims(float(m.group(1)))
-
-    # Metres × metres: "10m x 8m", "10 by 8 metres", "10×8m"
-    m = _re.search(
-        r'(\d+(?:\.\d+)?)\s*m?\s*[x×by]\s*(\d+(?:\.\d+)?)\s*m',
-        text, _re.IGNORECASE)
+    m = _DIMS_RE.search(text)
     if m:
         return float(m.group(1)), float(m.group(2))
 
@@ -83,6 +80,21 @@ def _extract_plot_from_text(text: str):
 # requiring local GNN checkpoint files at backend startup.
 _gnn = None
 
+# Layer 3 tables — built once at import instead of on every validation call.
+_MIN_SIZES = {
+    "bedroom": (2.5, 2.5), "bathroom": (1.5, 1.5),
+    "living":  (3.0, 3.0), "kitchen":  (2.0, 2.0),
+    "balcony": (1.5, 1.5), "parking":  (2.5, 5.0),
+    "garden":  (3.0, 3.0), "storage":  (1.0, 1.0),
+}
+# (type, area, width, height) for required rooms the generator left out
+_INJECT_DEFAULTS = (
+    ("bedroom",  9.0, 3.0, 3.0),
+    ("bathroom", 4.5, 1.8, 2.5),
+    ("living",  15.0, 4.0, 3.75),
+    ("kitchen",  9.0, 3.0, 3.0),
+)
+
 
 def _validate_and_fix(room_graph: dict, spec: dict) -> dict:
     """
@@ -94,15 +106,9 @@ def _validate_and_fix(room_graph: dict, spec: dict) -> dict:
     rooms = room_graph.get("rooms", [])
 
     # 1. Minimum room sizes
-    MIN_SIZES = {
-        "bedroom": (2.5, 2.5), "bathroom": (1.5, 1.5),
-        "living":  (3.0, 3.0), "kitchen":  (2.0, 2.0),
-        "balcony": (1.5, 1.5), "parking":  (2.5, 5.0),
-        "garden":  (3.0, 3.0), "storage":  (1.0, 1.0),
-    }
     for r in rooms:
         rtype = r.get("type", "other")
-        min_w, min_h = MIN_SIZES.get(rtype, (1.0, 1.0))
+        min_w, min_h = _MIN_SIZES.get(rtype, (1.0, 1.0))
         r["width"]  = max(r.get("width",  min_w), min_w)
         r["height"] = max(r.get("height", min_h), min_h)
 
@@ -112,15 +118,18 @@ def _validate_and_fix(room_graph: dict, spec: dict) -> dict:
     for _ in range(MAX_PASSES):
         moved = False
         for i in range(len(rooms)):
+            a = rooms[i]
             for j in range(i + 1, len(rooms)):
-                a, b = rooms[i], rooms[j]
-                ax1, ax2 = a["x"], a["x"] + a["width"]
-                ay1, ay2 = a["y"], a["y"] + a["height"]
-                bx1, bx2 = b["x"], b["x"] + b["width"]
-                by1, by2 = b["y"], b["y"] + b["height"]
-                ox = min(ax2, bx2) - max(ax1, bx1)
-                oy = min(ay2, by2) - max(ay1, by1)
-                if ox <= 0 or oy <= 0:
+                b = rooms[j]
+                # Separating-axis test: most pairs are rejected on x alone,
+                # so the y extents are only read when x overlaps
+                ax1, bx1 = a["x"], b["x"]
+                ox = min(ax1 + a["width"], bx1 + b["width"]) - max(ax1, bx1)
+                if ox <= 0:
+                    continue
+                ay1, by1 = a["y"], b["y"]
+                oy = min(ay1 + a["height"], by1 + b["height"]) - max(ay1, by1)
+                if oy <= 0:
                     continue
                 if ox < oy:
                     shift = (ox + PADDING) / 2.0
@@ -144,15 +153,9 @@ def _validate_and_fix(room_graph: dict, spec: dict) -> dict:
 
     # 3. Inject missing spec-required room types
     present = {r["type"] for r in rooms}
-    DEFAULTS = [
-        ("bedroom",  9.0, 3.0, 3.0),
-        ("bathroom", 4.5, 1.8, 2.5),
-        ("living",  15.0, 4.0, 3.75),
-        ("kitchen",  9.0, 3.0, 3.0),
-    ]
     max_x    = max((r["x"] + r["width"] for r in rooms), default=0.0)
     insert_y = 0.0
-    for rtype, area, w, h in DEFAULTS:
+    for rtype, area, w, h in _INJECT_DEFAULTS:
         if int(spec.get(rtype, 0)) > 0 and rtype not in present:
             rooms.append({
                 "id": f"{rtype}_injected", "type": rtype,
@@ -168,52 +171,67 @@ def _validate_and_fix(room_graph: dict, spec: dict) -> dict:
     if len(rooms) > 1:
         # Build undirected adjacency graph (index-based)
         n = len(rooms)
+        # Each room's edges are computed once, not once per pair.
+        bounds = [_room_bounds(r) for r in rooms]
         adj: list[set] = [set() for _ in range(n)]
         for i in range(n):
+            bi = bounds[i]
             for j in range(i + 1, n):
-                if _rooms_are_adjacent(rooms[i], rooms[j]):
+                if _bounds_adjacent(bi, bounds[j]):
                     adj[i].add(j)
                     adj[j].add(i)
 
-        # BFS to find all connected components
+        # BFS to find all connected components. Neighbours are walked in the
+        # order of the `adj[node] - {node}` difference set: iterating adj[node]
+        # directly visits them in a different order, which changes cluster
+        # order and therefore which anchor isolated rooms snap to.
         visited  = [False] * n
         clusters = []
         for start in range(n):
-            if not visited[start]:
-                queue   = [start]
-                cluster = []
-                while queue:
-                    node = queue.pop(0)
-                    if visited[node]:
-                        continue
-                    visited[node] = True
-                    cluster.append(node)
-                    queue.extend(adj[node] - set([node]))
-                clusters.append(cluster)
+            if visited[start]:
+                continue
+            visited[start] = True
+            queue   = deque([start])
+            cluster = []
+            while queue:
+                node = queue.popleft()
+                cluster.append(node)
+                for nb in adj[node] - {node}:
+                    if not visited[nb]:
+                        visited[nb] = True
+                        queue.append(nb)
+            clusters.append(cluster)
 
         # Main cluster = largest component
-        main_cluster = max(clusters, key=len)
-        main_indices = set(main_cluster)
+        main_idx     = max(range(len(clusters)), key=lambda c: len(clusters[c]))
+        main_indices = set(clusters[main_idx])
+
+        # Main-cluster rooms never move during snapping, so their centres are
+        # computed once here instead of inside every nearest-anchor search.
+        main_centres = {
+            k: (rooms[k]["x"] + rooms[k]["width"] / 2, rooms[k]["y"] + rooms[k]["height"] / 2)
+            for k in main_indices
+        }
 
         # Snap isolated rooms to the nearest room in the main cluster
-        for cluster in clusters:
-            if cluster == main_cluster:
+        for c, cluster in enumerate(clusters):
+            if c == main_idx:
                 continue
             for iso_idx in cluster:
                 # Find nearest main-cluster room by centre distance
                 iso = rooms[iso_idx]
                 icx = iso["x"] + iso["width"]  / 2
                 icy = iso["y"] + iso["height"] / 2
-                best_anchor = min(
-                    main_indices,
-                    key=lambda k: (
-                        (rooms[k]["x"] + rooms[k]["width"]  / 2 - icx) ** 2 +
-                        (rooms[k]["y"] + rooms[k]["height"] / 2 - icy) ** 2
-                    )
-                )
+                def _dist2(k, icx=icx, icy=icy):
+                    dx = main_centres[k][0] - icx
+                    dy = main_centres[k][1] - icy
+                    return dx * dx + dy * dy   # squared — ranking only, no sqrt/pow
+                best_anchor = min(main_indices, key=_dist2)
                 _snap_to_adjacent(iso, rooms[best_anchor])
                 # Add to main cluster so subsequent rooms can snap to it
                 main_indices.add(iso_idx)
+                main_centres[iso_idx] = (iso["x"] + iso["width"]  / 2,
+                                         iso["y"] + iso["height"] / 2)
 
     # 4b. Close any residual gaps left after snapping
     rooms = _close_gaps(rooms, max_gap=2.0)
@@ -235,29 +253,32 @@ def _validate_and_fix(room_graph: dict, spec: dict) -> dict:
     return room_graph
 
 
+def _room_bounds(r: dict) -> tuple:
+    """Return (x1, x2, y1, y2) edges of a room dict."""
+    return r["x"], r["x"] + r["width"], r["y"], r["y"] + r["height"]
+
+
+def _bounds_adjacent(a: tuple, b: tuple, tol: float = 0.6) -> bool:
+    """
+    Shared-wall test on (x1, x2, y1, y2) edge tuples — see _rooms_are_adjacent.
+    Left/right: x-edges within tol and y-ranges overlap.
+    Top/bottom: y-edges within tol and x-ranges overlap.
+    """
+    ax1, ax2, ay1, ay2 = a
+    bx1, bx2, by1, by2 = b
+    return (
+        ((abs(ax2 - bx1) <= tol or abs(bx2 - ax1) <= tol) and min(ay2, by2) > max(ay1, by1))
+        or
+        ((abs(ay2 - by1) <= tol or abs(by2 - ay1) <= tol) and min(ax2, bx2) > max(ax1, bx1))
+    )
+
+
 def _rooms_are_adjacent(a: dict, b: dict, tol: float = 0.6) -> bool:
     """
     Two rooms are considered adjacent if their edges are within `tol` metres
     AND their interiors overlap in the perpendicular axis (they actually share wall).
     """
-    ax1, ax2 = a["x"], a["x"] + a["width"]
-    ay1, ay2 = a["y"], a["y"] + a["height"]
-    bx1, bx2 = b["x"], b["x"] + b["width"]
-    by1, by2 = b["y"], b["y"] + b["height"]
-
-    # Check left/right adjacency: x-edges within tol, y-ranges overlap
-    x_close = (abs(ax2 - bx1) <= tol) or (abs(bx2 - ax1) <= tol)
-    y_overlap = min(ay2, by2) - max(ay1, by1) > 0
-    if x_close and y_overlap:
-        return True
-
-    # Check top/bottom adjacency: y-edges within tol, x-ranges overlap
-    y_close = (abs(ay2 - by1) <= tol) or (abs(by2 - ay1) <= tol)
-    x_overlap = min(ax2, bx2) - max(ax1, bx1) > 0
-    if y_close and x_overlap:
-        return True
-
-    return False
+    return _bounds_adjacent(_room_bounds(a), _room_bounds(b), tol)
 
 
 def _snap_to_adjacent(isolated: dict, anchor: dict) -> None:
@@ -468,6 +489,7 @@ async def run_pipeline(job: Job, project_name: Optional[str] = None,
             # ── GNN path: T5 NLP (Layer 1) + StructuralGNN (Layer 2) ──────────
             global _gnn
             if _gnn is None:
+                from backend.core.real_gnn import get_real_gnn
                 _gnn = get_real_gnn()
 
             job.update(JobStatus.PROCESSING, "Layer 1: Parsing natural language...", 10)
@@ -520,27 +542,26 @@ async def run_pipeline(job: Job, project_name: Optional[str] = None,
         job.update(JobStatus.PROCESSING, "Layer 3 complete — layout validated", 80)
         await asyncio.sleep(0)
 
-        # ── Layer 4a: 2D PNG Preview ───────────────────────────────────────────
-        job.update(JobStatus.PROCESSING, "Rendering 2D floor plan...", 85)
+        # ── Layer 4: 2D PNG Preview + IFC Export ──────────────────────────────
+        # Both only read room_graph, so the render and the IFC build/write run
+        # side by side on the default executor instead of back to back.
+        job.update(JobStatus.PROCESSING, "Layer 4: Rendering 2D floor plan and IFC file...", 85)
         await asyncio.sleep(0)
 
         png_path = str(PNG_OUTPUT_DIR / f"{job.job_id}.png")
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, lambda: _render_png(room_graph, png_path))
-        job.preview_png = png_path
-
-        # ── Layer 4b: IFC Export ───────────────────────────────────────────────
-        job.update(JobStatus.PROCESSING, "Layer 4: Generating IFC file...", 90)
-        await asyncio.sleep(0)
-
         pname    = project_name or f"AI {spec.get('unit_type','Building').title()}"
         ifc_path = str(IFC_OUTPUT_DIR / f"{job.job_id}.ifc")
 
-        ifc_path = await loop.run_in_executor(
-            None,
-            lambda: adapter.convert(room_graph, output_path=ifc_path, project_name=pname)
+        loop = asyncio.get_event_loop()
+        _, ifc_path = await asyncio.gather(
+            loop.run_in_executor(None, lambda: _render_png(room_graph, png_path)),
+            loop.run_in_executor(
+                None,
+                lambda: adapter.convert(room_graph, output_path=ifc_path, project_name=pname)
+            ),
         )
-        job.ifc_path = ifc_path
+        job.preview_png = png_path
+        job.ifc_path    = ifc_path
 
         job.update(JobStatus.DONE, "Pipeline complete — IFC ready for download", 100)
 
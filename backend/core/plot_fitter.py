@@ -129,18 +129,20 @@ def fit_rooms_to_plot(rooms: List[dict], plot_w: float, plot_h: float) -> List[d
                 rs[gidx]["y"] = round(key[1] + gr * (rs[gidx]["height"] + PADDING), 3)
 
     # ── Step 4: Bounded push-apart ───────────────────────────────────────
+    # Most pairs are separated on x, so test that axis first and only read
+    # the y extents for pairs that overlap horizontally.
+    n = len(rs)
     for _ in range(MAX_PASSES):
         moved = False
-        for i in range(len(rs)):
-            for j in range(i + 1, len(rs)):
-                a, b = rs[i], rs[j]
-                ax1, ax2 = a["x"], a["x"] + a["width"]
-                ay1, ay2 = a["y"], a["y"] + a["height"]
-                bx1, bx2 = b["x"], b["x"] + b["width"]
-                by1, by2 = b["y"], b["y"] + b["height"]
-                ox = min(ax2, bx2) - max(ax1, bx1)
-                oy = min(ay2, by2) - max(ay1, by1)
-                if ox <= 0 or oy <= 0:
+        for i in range(n):
+            a = rs[i]
+            for j in range(i + 1, n):
+                b = rs[j]
+                ox = min(a["x"] + a["width"], b["x"] + b["width"]) - max(a["x"], b["x"])
+                if ox <= 0:
+                    continue
+                oy = min(a["y"] + a["height"], b["y"] + b["height"]) - max(a["y"], b["y"])
+                if oy <= 0:
                     continue
                 moved = True
                 if ox < oy:
@@ -21,7 +21,7 @@ Architecture note:
         [12:18] padding zeros
 """
 
-import sys
+import threading
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -29,6 +29,8 @@ import numpy as np
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+from backend.core.spec_converter import spec_to_condition_vector
+
 _ROOT = Path(__file__).parent.parent.parent.resolve()
 
 MODEL_PATH = _ROOT / "models" / "resplan_gnn" / "gnn_best.pt"
@@ -63,11 +65,35 @@ _DISPLAY_NAME = {
     'inner':   'other',
 }
 
+# Spec keys in the order rooms are assigned to decoded nodes (largest area first)
+_ROOM_PRIORITY = (
+    'bedroom', 'bathroom', 'kitchen', 'living_room',
+    'dining_room', 'balcony', 'garden', 'storage', 'parking',
+)
+
+# Notebook room key → display name mapping
+_SPEC_TO_DISPLAY = {
+    'bedroom': 'bedroom', 'bathroom': 'bathroom',
+    'kitchen': 'kitchen', 'living_room': 'living',
+    'dining_room': 'dining', 'balcony': 'balcony',
+    'garden': 'garden', 'storage': 'storage', 'parking': 'parking',
+}
+
+# Typical width:height aspect ratio per room type, used to split a predicted area
+_ASPECTS = {
+    'bedroom': 1.2, 'bathroom': 1.0, 'living': 1.4, 'kitchen': 1.3,
+    'dining': 1.3, 'hallway': 3.5, 'balcony': 2.5, 'garden': 1.0,
+    'parking': 0.55, 'storage': 1.0, 'stair': 0.85, 'veranda': 2.2,
+}
+
 # Average canvas size (from preprocessing: median plan width 12.8 m)
 CANVAS_W    = 12.8   # metres
 CANVAS_H    = 12.0   # metres (approximation)
 CANVAS_AREA = CANVAS_W * CANVAS_H
 
+# Max number of condition vectors whose raw model output is kept in memory
+FORWARD_CACHE_SIZE = 128
+
 
 # ── StructuralGNN — identical to gnn-phase.ipynb ───────────────────────────────
 
@@ -206,22 +232,24 @@ def _decode_room_graph(node_features: np.ndarray,
     canvas_w = float(norm_constants.get('canvas_metres', CANVAS_W))
     canvas_h = canvas_w * (CANVAS_H / CANVAS_W)   # keep aspect ratio
 
-    rooms = []
-    for i in range(min(num_nodes, node_features.shape[0])):
-        feat = node_features[i]
+    # Room type and spatial features (indices 13, 14, 15) for all nodes at once
+    n        = max(min(num_nodes, node_features.shape[0]), 0)
+    type_ids = np.argmax(node_features[:n, :NUM_TYPES], axis=1).tolist()
+    a_norms  = np.clip(node_features[:n, 13], 0.01, 1.0).tolist()
+    cx_norms = np.clip(node_features[:n, 14], 0.01, 0.99).tolist()
+    cy_norms = np.clip(node_features[:n, 15], 0.01, 0.99).tolist()
 
-        # Room type
-        type_idx  = int(np.argmax(feat[:NUM_TYPES]))
-        room_type = ROOM_TYPES[type_idx]
+    rooms = []
+    for i in range(n):
+        room_type = ROOM_TYPES[type_ids[i]]
 
         # Skip non-room types (wall, inner)
         if room_type in ('wall', 'inner'):
             continue
 
-        # Spatial features at indices 13, 14, 15
-        a_norm  = float(np.clip(feat[13], 0.01, 1.0))
-        cx_norm = float(np.clip(feat[14], 0.01, 0.99))
-        cy_norm = float(np.clip(feat[15], 0.01, 0.99))
+        a_norm  = a_norms[i]
+        cx_norm = cx_norms[i]
+        cy_norm = cy_norms[i]
 
         # Denormalize
         cx     = cx_norm * canvas_w
@@ -229,11 +257,6 @@ def _decode_room_graph(node_features: np.ndarray,
         area   = a_norm  * canvas_w * canvas_h
 
         # Estimate width/height using type-specific aspect ratios (width:height)
-        _ASPECTS = {
-            'bedroom': 1.2, 'bathroom': 1.0, 'living': 1.4, 'kitchen': 1.3,
-            'dining': 1.3, 'hallway': 3.5, 'balcony': 2.5, 'garden': 1.0,
-            'parking': 0.55, 'storage': 1.0, 'stair': 0.85, 'veranda': 2.2,
-        }
         aspect = _ASPECTS.get(room_type, 1.2)
         width  = max(float(np.sqrt(area / aspect)), 1.5)
         height = max(float(area / width),            1.5)
@@ -286,6 +309,11 @@ class RealGNNAdapter:
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model  = None
         self.norm_constants = {}
+        # condition vector bytes → (node_features, adj_matrix). The model is
+        # deterministic in eval mode, so identical specs reuse one forward pass.
+        self._forward_cache: Dict[bytes, tuple] = {}
+        # generate() runs on executor threads, so cache reads/evictions are locked
+        self._cache_lock = threading.Lock()
         self._load()
 
     def _load(self):
@@ -320,7 +348,31 @@ class RealGNNAdapter:
         self.max_nodes = config.get("max_nodes", 20)
         print(f"[GNN] StructuralGNN loaded. Best epoch: {ckpt.get('epoch', '?')}")
 
-    @torch.no_grad()
+    @torch.inference_mode()
+    def _forward(self, cond_vec: np.ndarray):
+        """Run the model for one condition vector, reusing cached output."""
+        key = cond_vec.tobytes()
+        with self._cache_lock:
+            cached = self._forward_cache.get(key)
+        if cached is not None:
+            return cached
+
+        condition = torch.tensor(cond_vec, dtype=torch.float32).unsqueeze(0).to(self.device)
+        mask      = torch.ones(1, self.max_nodes, dtype=torch.float32).to(self.device)
+
+        output = self.model(condition, mask=mask)
+
+        node_features = output["node_features"][0].cpu().numpy()
+        adj_logits    = output["adjacency_logits"][0].cpu().numpy()
+        adj_matrix    = (1 / (1 + np.exp(-adj_logits)) > 0.5).astype(float)
+
+        with self._cache_lock:
+            if len(self._forward_cache) >= FORWARD_CACHE_SIZE:
+                self._forward_cache.pop(next(iter(self._forward_cache), None), None)
+            self._forward_cache[key] = (node_features, adj_matrix)
+        return node_features, adj_matrix
+
+    @torch.inference_mode()
     def generate(self, spec: Dict[str, Any]) -> Dict[str, Any]:
         """
         Args:
@@ -328,27 +380,14 @@ class RealGNNAdapter:
         Returns:
             Standard room_graph dict for RoomGraphToIFC
         """
-        sys.path.insert(0, str(_ROOT / "backend" / "core"))
-        from spec_converter import spec_to_condition_vector
         cond_vec = spec_to_condition_vector(spec)
         cond_vec = _build_condition_for_notebook(cond_vec)
 
-        condition = torch.tensor(cond_vec, dtype=torch.float32).unsqueeze(0).to(self.device)
-        mask      = torch.ones(1, self.max_nodes, dtype=torch.float32).to(self.device)
-
-        output = self.model(condition, mask=mask)
-
-        node_features = output["node_features"][0].cpu().numpy()
-        adj_logits    = output["adjacency_logits"][0].cpu().numpy()
-        adj_matrix    = (1 / (1 + np.exp(-adj_logits)) > 0.5).astype(float)
+        node_features, adj_matrix = self._forward(cond_vec)
 
         # Predict num_nodes from what the spec requested
-        ROOM_PRIORITY = [
-            'bedroom', 'bathroom', 'kitchen', 'living_room',
-            'dining_room', 'balcony', 'garden', 'storage', 'parking',
-        ]
         target_types: List[str] = []
-        for rtype in ROOM_PRIORITY:
+        for rtype in _ROOM_PRIORITY:
             count = int(spec.get(rtype, 0))
             target_types.extend([rtype] * count)
         if not target_types:
@@ -364,14 +403,6 @@ class RealGNNAdapter:
         # Sort by area desc and assign spec-driven types
         raw_rooms.sort(key=lambda r: r["area"], reverse=True)
 
-        # Notebook room key → display name mapping
-        _SPEC_TO_DISPLAY = {
-            'bedroom': 'bedroom', 'bathroom': 'bathroom',
-            'kitchen': 'kitchen', 'living_room': 'living',
-            'dining_room': 'dining', 'balcony': 'balcony',
-            'garden': 'garden', 'storage': 'storage', 'parking': 'parking',
-        }
-
         rooms = []
         for i, rtype in enumerate(target_types):
             display_type = _SPEC_TO_DISPLAY.get(rtype, rtype)
@@ -18,6 +18,7 @@ Condition vector format (18-dim) — must EXACTLY match preprocess_dataset.py:
 """
 
 import numpy as np
+from functools import lru_cache
 from typing import Dict, Any
 
 # ── Constants (MUST stay in sync with preprocess_dataset.py) ──────────────────
@@ -48,10 +49,15 @@ _NLP_ALIASES = {
 }
 
 
+@lru_cache(maxsize=256)
 def _resolve_key(key: str) -> str:
-    """Map any NLP output key to a canonical COND_ROOM_KEY."""
-    k = key.lower().strip().replace(' ', '_')
-    return _NLP_ALIASES.get(k, _NLP_ALIASES.get(key.lower().strip(), k))
+    """
+    Map any NLP output key to a canonical COND_ROOM_KEY.
+    Cached — specs reuse a small vocabulary of keys on every request.
+    """
+    stripped = key.lower().strip()
+    k = stripped.replace(' ', '_')
+    return _NLP_ALIASES.get(k, _NLP_ALIASES.get(stripped, k))
 
 
 def spec_to_condition_vector(spec: Dict[str, Any]) -> np.ndarray:
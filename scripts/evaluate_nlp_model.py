@@ -6,35 +6,77 @@ Test the trained Text-to-Spec model
 import json
 import torch
 from pathlib import Path
-from transformers import T5Tokenizer, T5ForConditionalGeneration
+from typing import List, Tuple
+from transformers import T5TokenizerFast, T5ForConditionalGeneration
+from transformers.modeling_outputs import BaseModelOutput
+
+DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+# BF16 on GPUs that support it; T5 activations overflow in FP16, and CPU stays FP32
+DTYPE = torch.bfloat16 if DEVICE.type == "cuda" and torch.cuda.is_bf16_supported() else torch.float32
 
 def load_model(model_dir: str):
-    """Load the trained model"""
+    """Load the trained model (moved to DEVICE once, here)"""
     print(f"Loading model from {model_dir}...")
-    tokenizer = T5Tokenizer.from_pretrained(model_dir)
-    model = T5ForConditionalGeneration.from_pretrained(model_dir)
+    # Rust-backed tokenizer; converted from spiece.model if tokenizer.json is absent
+    tokenizer = T5TokenizerFast.from_pretrained(model_dir)
+    model = T5ForConditionalGeneration.from_pretrained(model_dir, torch_dtype=DTYPE).to(DEVICE)
     model.eval()
     return tokenizer, model
 
-def generate_spec(text: str, tokenizer, model, max_length=256) -> str:
-    """Generate spec from text"""
+def generate_specs(texts: List[str], tokenizer, model, max_length=256,
+                   num_beams=1, beam_rescue=False) -> Tuple[List[str], List[int]]:
+    """
+    Generate specs for a batch of texts with one padded tokenizer + generate call.
+    With beam_rescue, greedy outputs that are not valid JSON are re-run with
+    beam search (4 beams) reusing the encoder output, and the first candidate
+    that parses is kept. Returns (specs, indices of beam-rescued outputs) so
+    callers can still report the model's own greedy validity.
+    """
     inputs = tokenizer(
-        text,
+        texts,
         return_tensors="pt",
         max_length=512,
-        truncation=True
-    )
+        truncation=True,
+        padding=True
+    ).to(model.device)
     
-    with torch.no_grad():
+    with torch.inference_mode():
+        encoded = model.get_encoder()(**inputs)
         outputs = model.generate(
-            inputs.input_ids,
-            max_length=max_length,
+            encoder_outputs=encoded,
+            attention_mask=inputs["attention_mask"],
+            max_new_tokens=max_length,
+            num_beams=num_beams,
+            early_stopping=num_beams > 1,
+            do_sample=False
+        )
+    
+    specs = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+    retry = [i for i, spec in enumerate(specs) if not is_valid_json(spec)]
+    if not (beam_rescue and num_beams == 1 and retry):
+        return specs, []
+
+    rows = torch.tensor(retry, device=model.device)
+    with torch.inference_mode():
+        outputs = model.generate(
+            encoder_outputs=BaseModelOutput(last_hidden_state=encoded.last_hidden_state[rows]),
+            attention_mask=inputs["attention_mask"][rows],
+            max_new_tokens=max_length,
             num_beams=4,
+            num_return_sequences=4,
             early_stopping=True,
             do_sample=False
         )
+    beams = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+    rescued = []
+    for k, i in enumerate(retry):
+        candidates = beams[4 * k:4 * k + 4]
+        valid = next((c for c in candidates if is_valid_json(c)), None)
+        if valid is not None:
+            specs[i] = valid
+            rescued.append(i)
     
-    return tokenizer.decode(outputs[0], skip_special_tokens=True)
+    return specs, rescued
 
 def is_valid_json(text: str) -> bool:
     """Check if text is valid JSON"""
@@ -64,15 +106,17 @@ def evaluate_model(model_dir: str):
     print("="*60)
     
     valid_json_count = 0
+    outputs, rescued = generate_specs(test_cases, tokenizer, model, beam_rescue=True)
+    rescued = set(rescued)
     
-    for i, text in enumerate(test_cases):
+    for i, (text, output) in enumerate(zip(test_cases, outputs)):
         print(f"\n--- Test {i+1} ---")
         print(f"INPUT:  {text}")
-        
-        output = generate_spec(text, tokenizer, model)
         print(f"OUTPUT: {output}")
         
-        if is_valid_json(output):
+        if i in rescued:
+            print("✗ Greedy output not valid JSON — beam fallback candidate shown")
+        elif is_valid_json(output):
             print("✓ Valid JSON")
             valid_json_count += 1
             try:
@@ -84,8 +128,9 @@ def evaluate_model(model_dir: str):
             print("✗ Not valid JSON")
     
     print("\n" + "="*60)
-    print(f"SUMMARY: {valid_json_count}/{len(test_cases)} outputs are valid JSON")
+    print(f"SUMMARY: {valid_json_count}/{len(test_cases)} greedy outputs are valid JSON")
     print(f"Accuracy: {100*valid_json_count/len(test_cases):.1f}%")
+    print(f"Beam fallback (4 beams) rescued {len(rescued)}/{len(test_cases) - valid_json_count} invalid outputs")
     print("="*60)
     
     # Additional metrics
@@ -39,6 +39,15 @@ class BIMGenerator:
             target_view="MODEL_VIEW", parent=ctx,
         )
 
+        # Every extrusion uses the same local placement and +Z direction, so
+        # build those entities once and reference them from each solid.
+        self._z_dir    = self.ifc.createIfcDirection((0.0, 0.0, 1.0))
+        self._solid_pl = self.ifc.createIfcAxis2Placement3D(
+            self.ifc.createIfcCartesianPoint((0.0, 0.0, 0.0)),
+            self._z_dir,
+            self.ifc.createIfcDirection((1.0, 0.0, 0.0)),
+        )
+
     # ── helpers ────────────────────────────────────────────────────────────────
 
     def _place(self, product, x_mm=0.0, y_mm=0.0, z_mm=0.0):
@@ -84,14 +93,8 @@ class BIMGenerator:
         )
         profile = self.ifc.createIfcArbitraryClosedProfileDef("AREA", None, polyline)
 
-        axis_pl = self.ifc.createIfcAxis2Placement3D(
-            self.ifc.createIfcCartesianPoint((0.0, 0.0, 0.0)),
-            self.ifc.createIfcDirection((0.0, 0.0, 1.0)),
-            self.ifc.createIfcDirection((1.0, 0.0, 0.0)),
-        )
         solid = self.ifc.createIfcExtrudedAreaSolid(
-            profile, axis_pl,
-            self.ifc.createIfcDirection((0.0, 0.0, 1.0)),
+            profile, self._solid_pl, self._z_dir,
             height_mm,
         )
 
@@ -162,14 +165,8 @@ class BIMGenerator:
             [self.ifc.createIfcCartesianPoint(pt) for pt in corners]
         )
         profile = self.ifc.createIfcArbitraryClosedProfileDef("AREA", None, polyline)
-        axis_pl = self.ifc.createIfcAxis2Placement3D(
-            self.ifc.createIfcCartesianPoint((0.0, 0.0, 0.0)),
-            self.ifc.createIfcDirection((0.0, 0.0, 1.0)),
-            self.ifc.createIfcDirection((1.0, 0.0, 0.0)),
-        )
         solid = self.ifc.createIfcExtrudedAreaSolid(
-            profile, axis_pl,
-            self.ifc.createIfcDirection((0.0, 0.0, 1.0)),
+            profile, self._solid_pl, self._z_dir,
             H,
         )
         shape_rep = self.ifc.createIfcShapeRepresentation(self._body, "Body", "SweptSolid", [solid])
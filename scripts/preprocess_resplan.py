@@ -218,7 +218,8 @@ def plan_to_graph_data(plan: Dict) -> Optional[Dict]:
     if n < 2:
         return None   # skip degenerate single-room plans
 
-    node_tensor = torch.tensor(np.stack(node_feats), dtype=torch.float32)  # [n, 16]
+    node_array  = np.stack(node_feats)                                     # [n, 16]
+    node_tensor = torch.tensor(node_array, dtype=torch.float32)
 
     # ── Build adjacency from the pre-computed graph field ─────────────────────
     adj = np.zeros((n, n), dtype=np.float32)
@@ -235,22 +236,16 @@ def plan_to_graph_data(plan: Dict) -> Optional[Dict]:
 
     # Fallback: spatial adjacency via intersection (buffer by 2% of plan width)
     if adj.sum() == 0:
-        buf = plan_w * 0.02
-        for i in range(n):
-            for j in range(i + 1, n):
-                # Use cx/cy distance as proxy (proper Shapely test is expensive at scale)
-                ci = node_tensor[i, NUM_TYPES:NUM_TYPES+2].numpy()
-                cj = node_tensor[j, NUM_TYPES:NUM_TYPES+2].numpy()
-                wi = node_tensor[i, NUM_TYPES + 2].item()
-                wj = node_tensor[j, NUM_TYPES + 2].item()
-                hi = node_tensor[i, NUM_TYPES + 3].item()
-                hj = node_tensor[j, NUM_TYPES + 3].item()
-                # Check if bboxes overlap (with small buffer)
-                overlap_x = abs(ci[0] - cj[0]) < (wi + wj) / 2 + 0.02
-                overlap_y = abs(ci[1] - cj[1]) < (hi + hj) / 2 + 0.02
-                if overlap_x and overlap_y:
-                    adj[i, j] = 1.0
-                    adj[j, i] = 1.0
+        # Use cx/cy distance as proxy (proper Shapely test is expensive at scale).
+        # All pairs at once: bboxes overlap (with small buffer) on both axes.
+        cx = node_array[:, NUM_TYPES]
+        cy = node_array[:, NUM_TYPES + 1]
+        w  = node_array[:, NUM_TYPES + 2].astype(np.float64)
+        h  = node_array[:, NUM_TYPES + 3].astype(np.float64)
+        overlap_x = np.abs(cx[:, None] - cx[None, :]) < (w[:, None] + w[None, :]) / 2 + 0.02
+        overlap_y = np.abs(cy[:, None] - cy[None, :]) < (h[:, None] + h[None, :]) / 2 + 0.02
+        adj = (overlap_x & overlap_y).astype(np.float32)
+        np.fill_diagonal(adj, 0.0)
 
     adj_tensor = torch.tensor(adj, dtype=torch.float32)
 
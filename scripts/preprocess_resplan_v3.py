@@ -60,14 +60,19 @@ Each batch .pt contains:
 Usage:
     .\\venv\\Scripts\\python.exe scripts\\preprocess_resplan_v3.py
     .\\venv\\Scripts\\python.exe scripts\\preprocess_resplan_v3.py --max-nodes 16 --batch-size 128
+    .\\venv\\Scripts\\python.exe scripts\\preprocess_resplan_v3.py --workers 1   # serial
 """
 
 import argparse
+import os
 import pickle
 import random
 import sys
 import time
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -76,6 +81,7 @@ import torch
 import torch.nn.functional as F
 import networkx as nx
 from shapely.geometry import Polygon, MultiPolygon
+from shapely.strtree import STRtree
 
 # ── ResPlan dataset helpers ────────────────────────────────────────────────────
 DATASET_DIR = Path(r"D:\Work\Uni\FYP\Dataset\ResPlan")
@@ -310,16 +316,14 @@ def build_adjacency(
                 edge_types[j, i] = etype
 
     # Fallback: spatial adjacency if graph gave us nothing
+    # (buffer each room once, then one STRtree bulk query for intersecting pairs)
     if adj.sum() == 0:
         buf = max(inner_w, inner_h) * 0.02
-        for i in range(n):
-            poly_i = rooms[i][2].buffer(buf)
-            for j in range(i + 1, n):
-                if poly_i.intersects(rooms[j][2].buffer(buf)):
-                    adj[i, j] = 1.0
-                    adj[j, i] = 1.0
-                    edge_types[i, j] = 2  # adjacency
-                    edge_types[j, i] = 2
+        buffered = [poly.buffer(buf) for _, _, poly in rooms]
+        src, dst = STRtree(buffered).query(buffered, predicate='intersects')
+        pairs = src != dst
+        adj[src[pairs], dst[pairs]] = 1.0
+        edge_types[src[pairs], dst[pairs]] = 2  # adjacency
 
     return adj, edge_types
 
@@ -344,10 +348,12 @@ def build_condition(rooms: List[Tuple[str, str, Polygon]], max_nodes: int) -> np
     return cond
 
 
-def plan_to_graph(plan: Dict, max_nodes: int, sample_id: int) -> Optional[Dict]:
+def plan_to_arrays(plan: Dict, max_nodes: int, sample_id: int) -> Optional[Dict]:
     """
-    Convert one ResPlan sample to a training-ready graph dict.
-    Returns None if invalid.
+    Convert one ResPlan sample to a graph dict of plain numpy arrays.
+    Returns None if invalid. This is what preprocessing workers return:
+    torch tensors sent back through a process pool would each travel as a
+    separate shared-memory segment, so tensors are built in the parent.
     """
     plan = normalize_keys(plan)
 
@@ -367,15 +373,36 @@ def plan_to_graph(plan: Dict, max_nodes: int, sample_id: int) -> Optional[Dict]:
     condition = build_condition(rooms, max_nodes)
 
     return {
-        'node_features': torch.tensor(node_features, dtype=torch.float32),
-        'adjacency':     torch.tensor(adj, dtype=torch.float32),
-        'edge_types':    torch.tensor(edge_types, dtype=torch.long),
-        'condition':     torch.tensor(condition, dtype=torch.float32),
+        'node_features': node_features,
+        'adjacency':     adj,
+        'edge_types':    edge_types,
+        'condition':     condition,
         'num_nodes':     len(rooms),
         'sample_id':     sample_id,
     }
 
 
+def arrays_to_graph(arrays: Dict) -> Dict:
+    """Turn a plan_to_arrays() result into the training-ready tensor graph dict."""
+    return {
+        'node_features': torch.tensor(arrays['node_features'], dtype=torch.float32),
+        'adjacency':     torch.tensor(arrays['adjacency'], dtype=torch.float32),
+        'edge_types':    torch.tensor(arrays['edge_types'], dtype=torch.long),
+        'condition':     torch.tensor(arrays['condition'], dtype=torch.float32),
+        'num_nodes':     arrays['num_nodes'],
+        'sample_id':     arrays['sample_id'],
+    }
+
+
+def plan_to_graph(plan: Dict, max_nodes: int, sample_id: int) -> Optional[Dict]:
+    """
+    Convert one ResPlan sample to a training-ready graph dict.
+    Returns None if invalid.
+    """
+    arrays = plan_to_arrays(plan, max_nodes, sample_id)
+    return None if arrays is None else arrays_to_graph(arrays)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # AUGMENTATION
 # ══════════════════════════════════════════════════════════════════════════════
@@ -585,6 +612,9 @@ def main():
     parser.add_argument('--seed',       type=int,   default=42)
     parser.add_argument('--no-augment', action='store_true')
     parser.add_argument('--out-dir',    type=str,   default=None)
+    # ProcessPoolExecutor on Windows rejects max_workers > 61
+    parser.add_argument('--workers',    type=int,   default=min(os.cpu_count() or 1, 61),
+                        help='processes for graph extraction (1 = serial)')
     args = parser.parse_args()
 
     MAX_NODES  = args.max_nodes
@@ -602,19 +632,29 @@ def main():
     print(f"  Loaded {len(raw_data)} samples in {time.time()-t0:.1f}s")
 
     # ── Convert ────────────────────────────────────────────────────────────────
-    print(f"\nExtracting graphs (max_nodes={MAX_NODES}) ...")
+    print(f"\nExtracting graphs (max_nodes={MAX_NODES}, workers={args.workers}) ...")
     graphs = []
     skipped = 0
 
-    for idx, plan in enumerate(raw_data):
-        g = plan_to_graph(plan, MAX_NODES, sample_id=idx)
-        if g is None:
-            skipped += 1
+    # Samples are independent — fan them out across processes. map() keeps
+    # input order, so sample_ids and the seeded shuffle below are unchanged.
+    # Workers return numpy arrays; tensors are built here in the parent.
+    with (ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1
+          else nullcontext()) as executor:
+        if executor is not None:
+            results = executor.map(plan_to_arrays, raw_data, repeat(MAX_NODES),
+                                   range(len(raw_data)), chunksize=64)
         else:
-            graphs.append(g)
+            results = map(plan_to_arrays, raw_data, repeat(MAX_NODES), range(len(raw_data)))
+
+        for idx, arrays in enumerate(results):
+            if arrays is None:
+                skipped += 1
+            else:
+                graphs.append(arrays_to_graph(arrays))
 
-        if (idx + 1) % 2000 == 0:
-            print(f"  {idx+1}/{len(raw_data)} → {len(graphs)} valid, {skipped} skipped")
+            if (idx + 1) % 2000 == 0:
+                print(f"  {idx+1}/{len(raw_data)} → {len(graphs)} valid, {skipped} skipped")
 
     print(f"\n  Valid: {len(graphs)} | Skipped: {skipped}")
 
@@ -23,6 +23,35 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
 
+# Spec patterns, compiled once (tried in order; first match wins).
+# Bare '(\d+)br' / '(\d+)ba' are already covered by the first pattern of
+# each list; '(\d+)b' stays a separate fallback so "3 bedroom" anywhere
+# still beats an earlier "2b/".
+BEDROOM_PATTERNS = [
+    re.compile(r'(\d+)[\s-]*(bedroom|bed|br)', re.IGNORECASE),
+    re.compile(r'(\d+)b(?=/|\s)', re.IGNORECASE),
+]
+BATHROOM_PATTERNS = [
+    re.compile(r'(\d+)[\s-]*(bathroom|bath|ba)', re.IGNORECASE),
+]
+# All boolean features in one alternation, so the text is scanned once;
+# the named group that matched is the spec key
+FEATURE_KEYS = ('kitchen', 'living_room', 'dining_room', 'study', 'garage')
+FEATURE_RE = re.compile(
+    r'(?P<kitchen>\bkitchen\b)'
+    r'|(?P<living_room>\bliving\s*room\b)'
+    r'|(?P<dining_room>\bdining\s*room\b)'
+    r'|(?P<study>\b(?:study|office)\b)'
+    r'|(?P<garage>\bgarage\b)',
+    re.IGNORECASE,
+)
+AREA_PATTERNS = [
+    re.compile(r'(\d+)\s*sq\s*m', re.IGNORECASE),
+    re.compile(r'(\d+)\s*sqm', re.IGNORECASE),
+    re.compile(r'(\d+)\s*square\s*meters?', re.IGNORECASE),
+]
+
+
 def extract_spec_from_text(text):
     """
     Extract building specification from text description.
@@ -31,51 +60,28 @@ def extract_spec_from_text(text):
     spec = {}
 
     # Extract bedrooms
-    bedroom_patterns = [
-        r'(\d+)[\s-]*(bedroom|bed|br)',
-        r'(\d+)br',
-        r'(\d+)b(?=/|\s)',
-    ]
-
-    for pattern in bedroom_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in BEDROOM_PATTERNS:
+        match = pattern.search(text)
         if match:
             spec['bedrooms'] = int(match.group(1))
             break
 
     # Extract bathrooms
-    bathroom_patterns = [
-        r'(\d+)[\s-]*(bathroom|bath|ba)',
-        r'(\d+)ba',
-    ]
-
-    for pattern in bathroom_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in BATHROOM_PATTERNS:
+        match = pattern.search(text)
         if match:
             spec['bathrooms'] = int(match.group(1))
             break
 
     # Extract rooms/features
-    if re.search(r'\bkitchen\b', text, re.IGNORECASE):
-        spec['kitchen'] = True
-    if re.search(r'\bliving\s*room\b', text, re.IGNORECASE):
-        spec['living_room'] = True
-    if re.search(r'\bdining\s*room\b', text, re.IGNORECASE):
-        spec['dining_room'] = True
-    if re.search(r'\b(study|office)\b', text, re.IGNORECASE):
-        spec['study'] = True
-    if re.search(r'\bgarage\b', text, re.IGNORECASE):
-        spec['garage'] = True
+    found = {m.lastgroup for m in FEATURE_RE.finditer(text)}
+    for key in FEATURE_KEYS:
+        if key in found:
+            spec[key] = True
 
     # Extract area (sqm or sqft)
-    area_patterns = [
-        r'(\d+)\s*sq\s*m',
-        r'(\d+)\s*sqm',
-        r'(\d+)\s*square\s*meters?',
-    ]
-
-    for pattern in area_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in AREA_PATTERNS:
+        match = pattern.search(text)
         if match:
             spec['total_area_sqm'] = int(match.group(1))
             break
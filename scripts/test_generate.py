@@ -28,7 +28,7 @@ sys.path.insert(0, str(ROOT / "scripts"))
 from train_cvae_gnn import (
     FloorplanCVAE, DEVICE, MAX_NODES, NUM_TYPES,
     CONDITION_DIM, ROOM_TYPES, BEST_PT, BEST_GEN_PT, BEST_RECON_PT, LATEST_PT,
-    NODE_FEAT_DIM, build_model_from_checkpoint,
+    NODE_FEAT_DIM, build_model_from_checkpoint, count_overlaps,
 )
 
 # ── Room types in the NEW 11-dim condition vector ──────────────────────────────
@@ -170,13 +170,15 @@ def generate_floorplan(model, prompt: str, n_samples: int = 3):
     # Sanitize prompt for filename
     safe_name = re.sub(r'[^a-z0-9]+', '_', prompt.lower().strip())[:40].strip('_')
 
-    for sample_idx in range(n_samples):
-        output = model.generate(cond.unsqueeze(0))
+    # Every sample shares the condition — decode them all in one batched pass
+    output = model.generate(cond.unsqueeze(0).repeat(n_samples, 1))
+    all_n_rooms = (output['num_logits'].argmax(dim=-1) + 1).tolist()
 
-        n_rooms = (output['num_logits'].argmax(dim=-1) + 1).item()
-        types = output['type_logits'][0, :n_rooms].argmax(dim=-1).cpu().numpy()
-        spatial = output['spatial'][0, :n_rooms].cpu().numpy()
-        adj = (torch.sigmoid(output['adj_logits'][0, :n_rooms, :n_rooms]) > 0.5).cpu().numpy()
+    for sample_idx in range(n_samples):
+        n_rooms = all_n_rooms[sample_idx]
+        types = output['type_logits'][sample_idx, :n_rooms].argmax(dim=-1).cpu().numpy()
+        spatial = output['spatial'][sample_idx, :n_rooms].cpu().numpy()
+        adj = (torch.sigmoid(output['adj_logits'][sample_idx, :n_rooms, :n_rooms]) > 0.5).cpu().numpy()
 
         print(f"\n--- Sample {sample_idx + 1} ({n_rooms} rooms) ---")
         rooms = []
@@ -192,13 +194,7 @@ def generate_floorplan(model, prompt: str, n_samples: int = 3):
             })
 
         # Count overlaps
-        n_overlaps = 0
-        for a in range(n_rooms):
-            for b in range(a + 1, n_rooms):
-                ix = max(0, min(spatial[a, 2], spatial[b, 2]) - max(spatial[a, 0], spatial[b, 0]))
-                iy = max(0, min(spatial[a, 3], spatial[b, 3]) - max(spatial[a, 1], spatial[b, 1]))
-                if ix * iy > 0.001:
-                    n_overlaps += 1
+        n_overlaps = count_overlaps(spatial)
 
         n_edges = int(adj.sum()) // 2
         print(f"  Overlaps: {n_overlaps} | Edges: {n_edges}")
@@ -197,9 +197,12 @@ async def main():
             save_single(llm_rooms, f'LLM: "{prompt}"',
                         out_dir / f"llm_{slug}.png", "LLM")
             print(f"\n[LLM] OK  {len(llm_rooms)} rooms generated")
-            for r in llm_rooms:
-                print(f"       {r['type']:12s}  {r['width']:.1f} x {r['height']:.1f} m  "
-                      f"@ ({r['x']:.1f}, {r['y']:.1f})")
+            if llm_rooms:
+                print("\n".join(
+                    f"       {r['type']:12s}  {r['width']:.1f} x {r['height']:.1f} m  "
+                    f"@ ({r['x']:.1f}, {r['y']:.1f})"
+                    for r in llm_rooms
+                ))
         except Exception as e:
             print(f"\n[LLM] FAILED  {e}")
 
@@ -211,9 +214,12 @@ async def main():
             save_single(gnn_rooms, f'GNN: "{prompt}"',
                         out_dir / f"gnn_{slug}.png", "StructuralGNN")
             print(f"\n[GNN] OK  {len(gnn_rooms)} rooms generated")
-            for r in gnn_rooms:
-                print(f"       {r['type']:12s}  {r['width']:.1f} x {r['height']:.1f} m  "
-                      f"@ ({r['x']:.1f}, {r['y']:.1f})")
+            if gnn_rooms:
+                print("\n".join(
+                    f"       {r['type']:12s}  {r['width']:.1f} x {r['height']:.1f} m  "
+                    f"@ ({r['x']:.1f}, {r['y']:.1f})"
+                    for r in gnn_rooms
+                ))
         except Exception as e:
             print(f"\n[GNN] FAILED  {e}")
 
@@ -1288,6 +1288,18 @@ def resolve_generation_checkpoint():
     return None
 
 
+def count_overlaps(spatial: np.ndarray, min_area: float = 0.001) -> int:
+    """
+    Number of room pairs whose bboxes intersect by more than min_area.
+    spatial rows are (x0, y0, x1, y1, ...); all pairs are tested at once
+    and only the upper triangle (a < b) is counted.
+    """
+    x0, y0, x1, y1 = spatial[:, 0], spatial[:, 1], spatial[:, 2], spatial[:, 3]
+    ix = np.maximum(np.minimum(x1[:, None], x1[None, :]) - np.maximum(x0[:, None], x0[None, :]), 0)
+    iy = np.maximum(np.minimum(y1[:, None], y1[None, :]) - np.maximum(y0[:, None], y0[None, :]), 0)
+    return int(np.triu(ix * iy > min_area, k=1).sum())
+
+
 def generate_samples(n_samples):
     """Generate floorplan samples from the best available generation checkpoint."""
     ckpt_path = resolve_generation_checkpoint()
@@ -1349,14 +1361,7 @@ def generate_samples(n_samples):
             x0, y0, x1, y1, area = spatial[j]
             print(f"    {rtype:10s}: x=[{x0:.2f},{x1:.2f}] y=[{y0:.2f},{y1:.2f}] area={area:.3f}")
 
-        # Check overlaps
-        n_overlaps = 0
-        for a in range(n_rooms):
-            for b in range(a + 1, n_rooms):
-                ix = max(0, min(spatial[a,2], spatial[b,2]) - max(spatial[a,0], spatial[b,0]))
-                iy = max(0, min(spatial[a,3], spatial[b,3]) - max(spatial[a,1], spatial[b,1]))
-                if ix * iy > 0.001:
-                    n_overlaps += 1
+        n_overlaps = count_overlaps(spatial)
         print(f"    Overlapping pairs: {n_overlaps}")
         print(f"    Adjacency edges:   {int(adj.sum()) // 2}")
 
@@ -251,11 +251,13 @@ def generate(model, prompt, n_samples=3, do_ifc=False):
     print(f"\nPrompt: \"{prompt}\"")
     print(f"Parsed: {counts}")
 
+    output = model.generate(cond.unsqueeze(0).repeat(n_samples, 1))
+    n_rooms_per_sample = (output['num_logits'].argmax(dim=-1) + 1).tolist()
+
     for si in range(n_samples):
-        output = model.generate(cond.unsqueeze(0))
-        n_rooms = (output['num_logits'].argmax(dim=-1) + 1).item()
-        types = output['type_logits'][0, :n_rooms].argmax(dim=-1).cpu().numpy()
-        spatial = output['spatial'][0, :n_rooms].cpu().numpy()
+        n_rooms = n_rooms_per_sample[si]
+        types = output['type_logits'][si, :n_rooms].argmax(dim=-1).cpu().numpy()
+        spatial = output['spatial'][si, :n_rooms].cpu().numpy()
 
         rooms = denormalize_rooms(types, spatial, n_rooms)
 
@@ -264,8 +266,10 @@ def generate(model, prompt, n_samples=3, do_ifc=False):
         for r in rooms:
             summary[r['type']] = summary.get(r['type'], 0) + 1
         print(f"\n  Sample {si+1}: {n_rooms} rooms — {summary}")
-        for r in rooms:
-            print(f"    {r['type']:10s}: ({r['x']:.1f}, {r['y']:.1f}) {r['width']:.1f}x{r['height']:.1f}m  area={r['area']:.1f}m2")
+        print("\n".join(
+            f"    {r['type']:10s}: ({r['x']:.1f}, {r['y']:.1f}) {r['width']:.1f}x{r['height']:.1f}m  area={r['area']:.1f}m2"
+            for r in rooms
+        ))
 
         # Save JSON
         json_path = OUT_DIR / f"{safe_name}_s{si+1}.json"